@@ -4,63 +4,273 @@ Provides smooth animations and visual effects
 """
 
 import tkinter as tk
+import tkinter.font as tkfont
+from tkinter import ttk
 import math
+import sys
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+
+# Shared animation ticker interval (~60 Hz), and the slow poll used
+# while every animated widget is hidden
+FRAME_MS = 16
+HIDDEN_FRAME_MS = 250
+
+# sRGB <-> linear-light lookup tables so gradients blend in physical light
+_LIN_STEPS = 4095
+_SRGB_TO_LIN = tuple(
+    (v / 255) / 12.92 if v / 255 <= 0.04045 else ((v / 255 + 0.055) / 1.055) ** 2.4
+    for v in range(256)
+)
+_LIN_TO_SRGB = tuple(
+    round(255 * (12.92 * x if x <= 0.0031308 else 1.055 * x ** (1 / 2.4) - 0.055))
+    for x in (i / _LIN_STEPS for i in range(_LIN_STEPS + 1))
+)
+
+
+@lru_cache(maxsize=512)
+def _hex_to_rgb(color):
+    """Parse a '#rrggbb' color into an (r, g, b) tuple"""
+    return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+
+
+# Two-digit hex for every channel value, to skip format-spec parsing
+_HEX = tuple(f'{v:02x}' for v in range(256))
+
+
+def _rgb_to_hex(r, g, b):
+    """Format an (r, g, b) triple as a '#rrggbb' color"""
+    return '#' + _HEX[r] + _HEX[g] + _HEX[b]
+
+
+@lru_cache(maxsize=32)
+def _gradient_rows(lin1, lin2, height):
+    """Precompute a vertical gradient as packed RGB bytes, one pixel per row"""
+    to_srgb = _LIN_TO_SRGB
+    n = _LIN_STEPS
+    ts = [i / height for i in range(height)]
+    
+    # Fill each channel in one pass straight into the interleaved buffer
+    out = bytearray(3 * height)
+    for channel, (lo, hi) in enumerate(zip(lin1, lin2)):
+        d = hi - lo
+        out[channel::3] = bytes([to_srgb[int((lo + d * t) * n + 0.5)] for t in ts])
+    return bytes(out)
+
+
+def _mix(color1, color2, t):
+    """Blend two hex colors in linear light, returning a hex color"""
+    lin1 = [_SRGB_TO_LIN[c] for c in _hex_to_rgb(color1)]
+    lin2 = [_SRGB_TO_LIN[c] for c in _hex_to_rgb(color2)]
+    return _rgb_to_hex(*(
+        _LIN_TO_SRGB[int((lo + (hi - lo) * t) * _LIN_STEPS + 0.5)]
+        for lo, hi in zip(lin1, lin2)
+    ))
+
+
+class _Anim:
+    """A registered per-frame update on the shared ticker"""
+    
+    __slots__ = ('update', 'end_time', 'widget', 'active')
+    
+    def __init__(self, update, end_time, widget):
+        self.update = update
+        self.end_time = end_time
+        self.widget = widget
+        self.active = True
+
 
 class AnimationManager:
     """Manager for smooth animations"""
     
     def __init__(self, root):
         self.root = root
-        self.animations = {}
-        self.animation_id = 0
+        self._active = []
+        self._tick_id = None
+        self._tick_hidden = False
+        self._watched = set()
+        self._batch_depth = 0
+        self._pending = {}
+        # The animation whose update is running, so apply() can tag its writes
+        self._current = None
+        root._animation_manager = self
+    
+    @classmethod
+    def for_widget(cls, widget):
+        """Return the shared manager for the window a widget lives in"""
+        root = widget.nametowidget('.')
+        manager = getattr(root, '_animation_manager', None)
+        if manager is None:
+            manager = cls(root)
+        return manager
+    
+    def register(self, update_fn, duration=None, widget=None):
+        """Add an update_fn(now) to the shared ticker; it returns False when done"""
+        end_time = None if duration is None else time.perf_counter() + duration / 1000
+        anim = _Anim(update_fn, end_time, widget)
+        self._active.append(anim)
+        
+        # Wake the ticker as soon as a hidden widget is shown again, and
+        # drop its animations once it is destroyed
+        if widget is not None and str(widget) not in self._watched:
+            self._watched.add(str(widget))
+            widget.bind('<Map>', self._wake, add='+')
+            widget.bind('<Destroy>', self._forget, add='+')
+        
+        if self._tick_id is None:
+            self._tick_id = self.root.after(FRAME_MS, self._tick)
+        return anim
+    
+    def cancel(self, anim):
+        """Remove an animation from the shared ticker"""
+        anim.active = False
+    
+    @contextmanager
+    def batch(self):
+        """Defer widget updates made through apply() to one flush at exit"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._pending:
+                pending, self._pending = self._pending, {}
+                for (fn, args), (owner, kwargs) in pending.items():
+                    # A failing write only stops the animation that queued it
+                    try:
+                        fn(*args, **kwargs)
+                    except tk.TclError:
+                        # The target widget was destroyed mid-frame
+                        if owner is not None:
+                            owner.active = False
+                    except Exception:
+                        if owner is not None:
+                            owner.active = False
+                        self.root.report_callback_exception(*sys.exc_info())
+                self.root.update_idletasks()
+    
+    def apply(self, fn, *args, **kwargs):
+        """Run a widget update now, or queue it if a batch is open"""
+        # Queued updates to the same target merge, so only the last value reaches Tk
+        if self._batch_depth:
+            entry = self._pending.setdefault((fn, args), [self._current, {}])
+            entry[0] = self._current
+            entry[1].update(kwargs)
+        else:
+            fn(*args, **kwargs)
+    
+    def _wake(self, event=None):
+        """Resume full-rate ticking after a slow hidden-widget poll"""
+        if self._tick_hidden and self._tick_id is not None:
+            self.root.after_cancel(self._tick_id)
+            self._tick_id = self.root.after(FRAME_MS, self._tick)
+            self._tick_hidden = False
+    
+    def _forget(self, event):
+        """Drop the animations of a destroyed widget"""
+        self._watched.discard(str(event.widget))
+        for anim in self._active:
+            if anim.widget is event.widget:
+                anim.active = False
+    
+    def _tick(self):
+        """Advance every visible animation by one frame"""
+        # This callback has fired; register() must schedule anew if we bail out
+        self._tick_id = None
+        now = time.perf_counter()
+        any_visible = False
+        try:
+            with self.batch():
+                for anim in self._active:
+                    if not anim.active:
+                        continue
+                    
+                    # A failing animation is dropped on its own so the rest keep running
+                    try:
+                        expired = anim.end_time is not None and now >= anim.end_time
+                        
+                        # Don't draw into unmapped tabs or minimized windows
+                        if anim.widget is not None and not anim.widget.winfo_viewable():
+                            if expired:
+                                anim.active = False
+                            continue
+                        
+                        any_visible = True
+                        self._current = anim
+                        if anim.update(now) is False or expired:
+                            anim.active = False
+                    except tk.TclError:
+                        # Its widget was destroyed without stopping the animation
+                        anim.active = False
+                    except Exception:
+                        anim.active = False
+                        self.root.report_callback_exception(*sys.exc_info())
+                    finally:
+                        self._current = None
+        finally:
+            self._active = [anim for anim in self._active if anim.active]
+            if self._active and self._tick_id is None:
+                self._tick_hidden = not any_visible
+                if any_visible:
+                    # Keep a steady frame rate by subtracting the time this tick took
+                    work_ms = (time.perf_counter() - now) * 1000
+                    delay = max(1, round(FRAME_MS - work_ms))
+                else:
+                    delay = HIDDEN_FRAME_MS
+                self._tick_id = self.root.after(delay, self._tick)
     
     def fade_in(self, widget, duration=500, start_alpha=0, end_alpha=1):
         """Fade in animation"""
-        animation_id = self.animation_id
-        self.animation_id += 1
+        # Only toplevel windows support opacity; don't tick for anything else
+        if not isinstance(widget, (tk.Tk, tk.Toplevel)):
+            return None
         
-        steps = 20
-        step_duration = duration // steps
-        current_step = [0]
+        steps = max(1, duration // FRAME_MS)
+        d_alpha = (end_alpha - start_alpha) / steps
+        alphas = [start_alpha + d_alpha * i for i in range(1, steps + 1)]
+        frames = iter(alphas)
+        widget.attributes('-alpha', start_alpha)
         
-        def animate():
-            if current_step[0] < steps:
-                progress = current_step[0] / steps
-                alpha = start_alpha + (end_alpha - start_alpha) * progress
-                # Update opacity if supported by widget
-                current_step[0] += 1
-                self.root.after(step_duration, animate)
+        def update(now):
+            alpha = next(frames, None)
+            if alpha is None:
+                return False
+            self.apply(widget.attributes, '-alpha', alpha)
+            return True
         
-        self.root.after(step_duration, animate)
-        return animation_id
+        return self.register(update, widget=widget)
     
     def slide_in(self, widget, from_x=0, from_y=0, to_x=0, to_y=0, duration=500):
         """Slide in animation"""
-        animation_id = self.animation_id
-        self.animation_id += 1
+        # Only placed widgets can be positioned by coordinates
+        if widget.winfo_manager() != 'place':
+            return None
         
-        steps = 20
-        step_duration = duration // steps
-        current_step = [0]
+        steps = max(1, duration // FRAME_MS)
+        dx = (to_x - from_x) / steps
+        dy = (to_y - from_y) / steps
+        positions = [(round(from_x + dx * i), round(from_y + dy * i)) for i in range(1, steps + 1)]
+        frames = iter(positions)
+        widget.place(x=from_x, y=from_y)
         
-        def animate():
-            if current_step[0] < steps:
-                progress = current_step[0] / steps
-                x = from_x + (to_x - from_x) * progress
-                y = from_y + (to_y - from_y) * progress
-                
-                # Update position if supported
-                current_step[0] += 1
-                self.root.after(step_duration, animate)
+        def update(now):
+            position = next(frames, None)
+            if position is None:
+                return False
+            self.apply(widget.place, x=position[0], y=position[1])
+            return True
         
-        self.root.after(step_duration, animate)
-        return animation_id
+        return self.register(update, widget=widget)
 
 
 class LoadingAnimation:
     """Animated loading indicator"""
     
-    def __init__(self, parent, width=50, height=50):
+    # Arc speed in degrees per second (10 degrees every 50 ms)
+    DEGREES_PER_SECOND = 200
+    
+    def __init__(self, parent, width=50, height=50, max_redraw_rate=60):
         self.canvas = tk.Canvas(
             parent,
             width=width,
@@ -71,42 +281,74 @@ class LoadingAnimation:
         self.width = width
         self.height = height
         self.rotation = 0
+        self._frame = 0
         self.animation_running = False
-    
-    def start(self):
-        """Start loading animation"""
-        self.animation_running = True
-        self.animate()
-    
-    def animate(self):
-        """Animate the loading indicator"""
-        if not self.animation_running:
-            return
+        self._anim = None
         
-        self.rotation = (self.rotation + 10) % 360
-        self.canvas.delete("all")
+        # Never redraw faster than max_redraw_rate; the arc only ever sits
+        # at the angles reachable at that rate
+        self.max_redraw_rate = max_redraw_rate
+        frames = max(1, round(360 / self.DEGREES_PER_SECOND * max_redraw_rate))
+        self._frame_angles = tuple(round(i * 360 / frames) for i in range(frames))
         
-        # Draw rotating arc
-        center_x = self.width / 2
-        center_y = self.height / 2
-        radius = self.width / 3
-        
-        # Draw circle background
-        self.canvas.create_oval(
+        # Build the canvas items once; frames only update the arc angle
+        center_x = width / 2
+        center_y = height / 2
+        radius = width / 3
+        self._bg_oval = self.canvas.create_oval(
             center_x - radius,
             center_y - radius,
             center_x + radius,
             center_y + radius,
             fill='#0d47a1',
-            outline='#1976d2'
+            outline='#1976d2',
+            state='hidden'
+        )
+        self._arc = self.canvas.create_arc(
+            center_x - radius * 0.7,
+            center_y - radius * 0.7,
+            center_x + radius * 0.7,
+            center_y + radius * 0.7,
+            style='arc',
+            start=0,
+            extent=90,
+            outline='white',
+            width=3,
+            state='hidden'
         )
+    
+    def start(self):
+        """Start loading animation"""
+        if self.animation_running:
+            return
+        self.animation_running = True
+        self.canvas.itemconfigure(self._bg_oval, state='normal')
+        self.canvas.itemconfigure(self._arc, state='normal')
+        
+        self._start_time = time.perf_counter()
+        self._manager = AnimationManager.for_widget(self.canvas)
+        self._anim = self._manager.register(self.animate, widget=self.canvas)
+    
+    def animate(self, now):
+        """Advance the loading indicator"""
+        if not self.animation_running:
+            return False
         
-        self.canvas.after(50, self.animate)
+        frame = int((now - self._start_time) * self.max_redraw_rate) % len(self._frame_angles)
+        if frame != self._frame:
+            self._frame = frame
+            self.rotation = self._frame_angles[frame]
+            self._manager.apply(self.canvas.itemconfig, self._arc, start=self.rotation)
+        return True
     
     def stop(self):
         """Stop loading animation"""
         self.animation_running = False
-        self.canvas.delete("all")
+        if self._anim is not None:
+            self._manager.cancel(self._anim)
+            self._anim = None
+        self.canvas.itemconfigure(self._bg_oval, state='hidden')
+        self.canvas.itemconfigure(self._arc, state='hidden')
     
     def pack(self, **kwargs):
         """Pack the canvas"""
@@ -114,44 +356,62 @@ class LoadingAnimation:
 
 
 class PulseEffect:
-    """Pulsing effect for labels"""
+    """Pulsing background effect for labels"""
     
-    def __init__(self, label, color1='#0d47a1', color2='#ffffff'):
+    def __init__(self, label, color1='#0d47a1', color2='#ffffff', max_redraw_rate=60):
         self.label = label
         self.color1 = color1
         self.color2 = color2
+        self.max_redraw_rate = max_redraw_rate
         self.animation_running = False
         self.step = 0
+        self._anim = None
+        self._original_bg = None
     
     def start(self, duration=1000):
         """Start pulsing effect"""
+        self.stop()
+        self._original_bg = self.label.cget('bg')
         self.animation_running = True
         self.duration = duration
-        self.step = 0
-        self.pulse()
+        self.step = -1
+        
+        # One pulse state per redraw at max_redraw_rate; build their colors once
+        states = max(2, round(duration * self.max_redraw_rate / 1000))
+        half = states / 2
+        self._palette = [
+            _mix(self.color1, self.color2, (i / half) if i < half else (states - i) / half)
+            for i in range(states)
+        ]
+        self._start_time = time.perf_counter()
+        self._manager = AnimationManager.for_widget(self.label)
+        self._anim = self._manager.register(self.pulse, widget=self.label)
     
-    def pulse(self):
+    def pulse(self, now):
         """Execute pulse animation"""
         if not self.animation_running:
-            return
-        
-        # Calculate interpolation
-        progress = (self.step % 20) / 20
-        
-        # Simple color transition
-        if progress < 0.5:
-            # Fade in
-            intensity = int(progress * 2 * 255)
-        else:
-            # Fade out
-            intensity = int((1 - (progress - 0.5) * 2) * 255)
+            return False
         
-        self.step += 1
-        self.label.after(self.duration // 20, self.pulse)
+        step = int((now - self._start_time) * self.max_redraw_rate)
+        if step != self.step:
+            self.step = step
+            self._manager.apply(self.label.config, bg=self._palette[step % len(self._palette)])
+        return True
     
     def stop(self):
         """Stop pulsing effect"""
         self.animation_running = False
+        if self._anim is not None:
+            self._manager.cancel(self._anim)
+            self._anim = None
+        
+        # Put the label's own background back
+        if self._original_bg is not None:
+            try:
+                self._manager.apply(self.label.config, bg=self._original_bg)
+            except tk.TclError:
+                pass
+            self._original_bg = None
 
 
 class ScaleAnimation:
@@ -162,20 +422,59 @@ class ScaleAnimation:
         self.target_scale = target_scale
         self.duration = duration
         self.original_font = None
+        self._anim = None
+        self._manager = None
     
     def animate(self):
         """Execute scale animation"""
         steps = 10
-        step_duration = self.duration // steps
         
-        def scale_step(current_step):
-            if current_step <= steps:
-                progress = current_step / steps
-                # Scale effect by adjusting size or position
-                current_step += 1
-                self.widget.after(step_duration, lambda: scale_step(current_step))
+        # Finish a running animation first so the widget's own font is what we save
+        self.stop()
+        
+        # Scale a private copy of the widget font through precomputed sizes
+        self.original_font = self.widget.cget('font')
+        base_size = tkfont.Font(font=self.original_font).cget('size')
+        self._sizes = [
+            round(base_size * (1 + (self.target_scale - 1) * i / steps))
+            for i in range(steps + 1)
+        ]
+        self._font = tkfont.Font(font=self.original_font)
+        self.widget.config(font=self._font)
+        manager = self._manager = AnimationManager.for_widget(self.widget)
+        start_time = time.perf_counter()
+        current_step = 0
         
-        scale_step(0)
+        def scale_step(now):
+            nonlocal current_step
+            step = min(steps, int((now - start_time) * 1000 * steps / self.duration))
+            if step >= steps:
+                # Hand the widget back its own font once the animation completes
+                self._restore()
+                return False
+            if step != current_step:
+                current_step = step
+                manager.apply(self._font.configure, size=self._sizes[step])
+            return True
+        
+        # No fixed duration: a hidden widget still gets its font back once shown
+        self._anim = manager.register(scale_step, widget=self.widget)
+        return self._anim
+    
+    def stop(self):
+        """Stop the animation and restore the widget's original font"""
+        if self._anim is not None:
+            self._manager.cancel(self._anim)
+            self._restore()
+    
+    def _restore(self):
+        """Give the widget back the font it had before the animation"""
+        self._anim = None
+        if self.original_font is not None:
+            try:
+                self._manager.apply(self.widget.config, font=self.original_font)
+            except tk.TclError:
+                pass
 
 
 class GradientFrame(tk.Canvas):
@@ -185,33 +484,87 @@ class GradientFrame(tk.Canvas):
         super().__init__(parent, **kwargs)
         self.color1 = color1
         self.color2 = color2
+        self._lin_colors = None
+        self._strip = None
+        self._strip_height = 0
+        self._photo = None
+        self._photo_size = (0, 0)
+        self._img_id = None
+        self._redraw_pending = False
+        self._last_drawn = None
         self.bind('<Configure>', self.draw_gradient)
     
     def draw_gradient(self, event=None):
+        """Schedule a gradient redraw, coalescing bursts of Configure events"""
+        if event is not None:
+            size = (event.width, event.height)
+        else:
+            size = (self.winfo_width(), self.winfo_height())
+        
+        # Nothing to do if size and colors match what is already on screen
+        if (*size, self.color1, self.color2) == self._last_drawn:
+            return
+        
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._do_draw_gradient)
+    
+    def _do_draw_gradient(self):
         """Draw gradient background"""
+        self._redraw_pending = False
         width = self.winfo_width()
         height = self.winfo_height()
         
         if width <= 1:
             return
         
-        # Create gradient
-        for i in range(height):
-            ratio = i / height
-            r1 = int(self.color1[1:3], 16)
-            g1 = int(self.color1[3:5], 16)
-            b1 = int(self.color1[5:7], 16)
-            
-            r2 = int(self.color2[1:3], 16)
-            g2 = int(self.color2[3:5], 16)
-            b2 = int(self.color2[5:7], 16)
-            
-            r = int(r1 + (r2 - r1) * ratio)
-            g = int(g1 + (g2 - g1) * ratio)
-            b = int(b1 + (b2 - b1) * ratio)
-            
-            color = f'#{r:02x}{g:02x}{b:02x}'
-            self.create_line(0, i, width, i, fill=color)
+        key = (width, height, self.color1, self.color2)
+        if key == self._last_drawn:
+            return
+        
+        # Parse endpoints once per color change and keep them in linear light
+        if self._lin_colors is None or self._lin_colors[0] != (self.color1, self.color2):
+            lin1 = tuple(_SRGB_TO_LIN[c] for c in _hex_to_rgb(self.color1))
+            lin2 = tuple(_SRGB_TO_LIN[c] for c in _hex_to_rgb(self.color2))
+            self._lin_colors = ((self.color1, self.color2), lin1, lin2)
+            self._strip = None
+        _, lin1, lin2 = self._lin_colors
+        
+        # The gradient only varies along Y, so render a 1px-wide strip per
+        # height and let Tk zoom it across the width in a single image
+        if self._strip is None or self._strip_height != height:
+            rows = _gradient_rows(lin1, lin2, height)
+            data = f'P6 1 {height} 255\n'.encode() + rows
+            self._strip = tk.PhotoImage(master=self, width=1, height=height, data=data, format='PPM')
+            self._strip_height = height
+            self._photo = None
+        
+        if self._photo is None or self._photo_size != (width, height):
+            self._photo = self._strip.zoom(width, 1)
+            self._photo_size = (width, height)
+        
+        if self._img_id is None:
+            self._img_id = self.create_image(0, 0, anchor='nw', image=self._photo)
+            self.tag_lower(self._img_id)
+        else:
+            self.itemconfig(self._img_id, image=self._photo)
+        
+        self._last_drawn = key
+
+
+def ensure_hover_style(normal_color, hover_color, master=None):
+    """Return a shared ttk button style that swaps background on hover"""
+    style_name = f'Hover_{normal_color[1:]}_{hover_color[1:]}.TButton'
+    style = ttk.Style(master)
+    
+    # Styles belong to a Tk interpreter, so each root remembers its own
+    root = style.master._root()
+    configured = root.__dict__.setdefault('_hover_styles', set())
+    if style_name not in configured:
+        style.configure(style_name, background=normal_color)
+        style.map(style_name, background=[('active', hover_color)])
+        configured.add(style_name)
+    return style_name
 
 
 class HoverEffect:
@@ -222,6 +575,11 @@ class HoverEffect:
         self.normal_color = normal_color
         self.hover_color = hover_color
         
+        # ttk buttons let Tk handle the state change through a shared style
+        if isinstance(button, ttk.Button):
+            button.configure(style=ensure_hover_style(normal_color, hover_color, button.nametowidget('.')))
+            return
+        
         self.button.bind('<Enter>', self.on_hover)
         self.button.bind('<Leave>', self.on_leave)
     
@@ -5,15 +5,26 @@ Professional Medical Intelligence Platform using CustomTkinter 5.2.0
 """
 
 import customtkinter as ctk
-from tkinter import messagebox
-from crewai import Agent, Task, Crew, LLM
+from tkinter import messagebox, ttk
 import os
-from dotenv import load_dotenv
+import re
+import json
+import queue
 import threading
-import time
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter, deque
+import numpy as np
+from healthcare_cache import CACHE_DIR, ExactCache, SemanticCache
 
-# Load API key
-load_dotenv()
+# CrewAI is heavy to import, so it is loaded after the window is up
+# (see HealthcareAssistantGUI._ensure_crewai)
+Agent = Task = Crew = LLM = None
+
+# Load API key from .env only when it isn't already in the environment
+if "GOOGLE_API_KEY" not in os.environ:
+    from dotenv import load_dotenv
+    load_dotenv()
 
 # Set appearance and theme
 ctk.set_appearance_mode("light")
@@ -35,6 +46,201 @@ COLORS = {
     "hover": "#0A5F6F",        # Darker Teal
 }
 
+# Specialist agent definitions, keyed by the names shown in the specialist picker
+_AGENT_CONFIGS = {
+    "Medical Advisor": {
+        "role": "Medical Advisor",
+        "goal": "Provide accurate medical information and comprehensive guidance",
+        "backstory": """You are an experienced medical advisor with extensive knowledge 
+        of various medical conditions, symptoms, and treatments. You provide clear, 
+        evidence-based medical information while emphasizing the importance of consulting 
+        healthcare professionals for diagnosis and treatment."""
+    },
+    "Symptom Analyzer": {
+        "role": "Symptom Analyzer",
+        "goal": "Analyze symptoms and suggest possible conditions",
+        "backstory": """You are a symptom analysis expert trained to identify patterns 
+        in patient-reported symptoms. You provide possible explanations for symptoms, 
+        assess severity, and recommend when immediate medical attention is needed."""
+    },
+    "Treatment Recommender": {
+        "role": "Treatment Recommender",
+        "goal": "Suggest evidence-based treatment options",
+        "backstory": """You are a treatment specialist knowledgeable about various 
+        medical treatments, medications, and therapies. You provide comprehensive 
+        treatment information while emphasizing proper medical supervision."""
+    },
+    "Nutrition Specialist": {
+        "role": "Nutrition Specialist",
+        "goal": "Provide dietary guidance and nutritional advice",
+        "backstory": """You are a certified nutritionist with expertise in therapeutic 
+        nutrition and dietary management of diseases. You provide personalized 
+        nutritional guidance based on health conditions."""
+    },
+    "Mental Health Counselor": {
+        "role": "Mental Health Counselor",
+        "goal": "Provide mental health support and coping strategies",
+        "backstory": """You are a compassionate mental health counselor trained in 
+        psychology and therapeutic techniques. You provide emotional support, coping 
+        strategies, and guidance for mental health concerns."""
+    },
+    "Fitness Coach": {
+        "role": "Fitness Coach",
+        "goal": "Provide exercise guidance and fitness recommendations",
+        "backstory": """You are a certified fitness coach with expertise in exercise 
+        physiology and rehabilitation. You create safe, effective exercise recommendations 
+        tailored to individual health conditions."""
+    },
+    "Disease Educator": {
+        "role": "Disease Educator",
+        "goal": "Educate about diseases, prevention, and management",
+        "backstory": """You are a health educator specializing in disease information 
+        and prevention strategies. You explain complex medical concepts in clear language."""
+    },
+    "Preventive Medicine Expert": {
+        "role": "Preventive Medicine Expert",
+        "goal": "Provide prevention strategies and wellness recommendations",
+        "backstory": """You are a preventive medicine expert focused on disease prevention 
+        and health promotion. You provide actionable recommendations for maintaining health."""
+    },
+    "Emergency Response Advisor": {
+        "role": "Emergency Response Advisor",
+        "goal": "Provide emergency guidance and critical response information",
+        "backstory": """You are an emergency medicine advisor trained in crisis management. 
+        You provide immediate guidance for emergencies and identify when to call emergency services."""
+    }
+}
+
+# Emoji used across the UI, pre-rendered at startup to warm Tk's font fallback
+_UI_EMOJI = "🏥🩺📊💡👨‍⚕️📋💬📝🗑️🔄⚠️🥗🏃😴🧘🚫💚🧠🔍💊💪📚🛡️🚨📅●"
+
+# Hint shown in the empty query box
+_PLACEHOLDER = "Describe your symptoms or health question in detail..."
+
+# Consultation prompt, filled in with the specialist and the user's query
+_TASK_TEMPLATE = """
+As a {specialist}, analyze the following health query and provide helpful guidance:
+
+QUERY: {query}
+
+INSTRUCTIONS:
+1. Provide clear, accurate information
+2. If symptoms are mentioned, explain possible conditions (not diagnoses)
+3. Suggest when to seek medical attention
+4. Provide practical recommendations
+5. Always remind this is informational, not medical advice
+6. Be compassionate and supportive
+
+Provide a comprehensive, well-structured response.
+"""
+
+# Framing around a consultation result in the output panel
+_HEADER_TMPL = """
+┌─────────────────────────────────────────────────────────┐
+│ 🏥 {spec}
+└─────────────────────────────────────────────────────────┘
+📅 Consultation Date: {ts}
+
+"""
+
+_FOOTER = """
+
+─────────────────────────────────────────────────────────
+
+⚠️  MEDICAL DISCLAIMER
+This guidance is informational only and not a substitute for 
+professional medical advice. Always consult qualified healthcare 
+professionals for diagnosis, treatment, and emergency situations.
+
+─────────────────────────────────────────────────────────"""
+
+# Consultations evicted from the in-memory history are appended here
+_HISTORY_LOG = os.path.join(os.path.expanduser("~"), ".healthcare_history.log")
+
+# Simulated guidance shown when the live consultation fails
+_FALLBACK_TEMPLATE = """
+┌─────────────────────────────────────────────────────────┐
+│ 🏥 {specialist} (Demo Response)
+└─────────────────────────────────────────────────────────┘
+📅 Consultation Date: {timestamp}
+
+It appears the live AI consultation failed to complete (network or API error).
+Below is a simulated guidance response so you can continue testing the application layout and flow.
+
+-- SAMPLE GUIDANCE START --
+
+Thank you for describing your concern. Based on the symptoms you've provided, here are some possibilities and suggestions:
+
+- Common causes may include muscle strain, overuse, or minor nerve irritation.
+- If you have sudden severe pain, numbness, weakness, or loss of function, seek immediate medical attention.
+- For mild to moderate pain: rest, ice, compression, elevation (RICE) and use over-the-counter analgesics as appropriate.
+- Monitor for worsening symptoms and consult a healthcare professional if symptoms persist beyond a few days.
+
+-- SAMPLE GUIDANCE END --
+
+⚠️ Note: This is a simulated message. The real AI consultation failed with error: {err}
+
+"""
+
+# Prior-consultation summary appended to the task prompt
+_CONTEXT_TMPL = """
+CONTEXT (the user's recent consultations, for continuity only):
+{memory}
+"""
+
+# Common words that carry no symptom information
+_STOPWORDS = frozenset("""
+a about after all also am an and any are as at be been before but by can could
+do does doing for from get getting had has have having how i i'm if in into is
+it it's its just like lately me more most my no not now of on or other over
+really should since so some still than that the their them then there these
+they this to too up very was what when where which while who why will with
+would you your feel feeling felt days weeks week day best good bad help
+""".split())
+
+
+class _MemoryStore:
+    """Compact summary of recent consultations sent to the agent as context"""
+    
+    MAX_ENTRIES = 3
+    MAX_KEYWORDS = 6
+    # Roughly 500 tokens of JSON
+    MAX_CHARS = 2000
+    
+    def __init__(self):
+        self._entries = deque(maxlen=self.MAX_ENTRIES)
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def _keywords(cls, query):
+        """Return the most frequent informative words of a query"""
+        words = re.findall(r"[a-z][a-z'-]+", query.lower())
+        counts = Counter(w for w in words if len(w) > 2 and w not in _STOPWORDS)
+        return [w for w, _ in counts.most_common(cls.MAX_KEYWORDS)]
+    
+    def record(self, specialist, query, timestamp):
+        """Remember a consultation as (specialist, symptom keywords, date)"""
+        entry = {"spec": specialist, "symptoms": self._keywords(query), "date": timestamp[:10]}
+        with self._lock:
+            self._entries.append(entry)
+    
+    def summarize(self):
+        """Return the remembered consultations, oldest first"""
+        with self._lock:
+            return {"recent": list(self._entries)}
+    
+    def context(self):
+        """Return the summary as compact JSON within MAX_CHARS, or '' if empty"""
+        summary = self.summarize()
+        recent = summary["recent"]
+        while recent:
+            text = json.dumps(summary, ensure_ascii=False, separators=(",", ":"))
+            if len(text) <= self.MAX_CHARS:
+                return text
+            del recent[0]
+        return ""
+
+
 class HealthcareAssistantGUI:
     def __init__(self):
         self.root = ctk.CTk()
@@ -48,7 +254,7 @@ class HealthcareAssistantGUI:
         height = min(800, max(640, screen_h - 120))
         self.root.geometry(f"{width}x{height}")
         self.root.minsize(900, 600)
-        self.root.update_idletasks()
+        self._init_height = height
 
         # Determine a UI scale factor based on screen resolution so fonts/paddings shrink on smaller laptops
         # Allow a bit more shrinking on smaller displays (floor 0.72) for 14" screens
@@ -68,6 +274,30 @@ class HealthcareAssistantGUI:
         self.font_norm = ctk.CTkFont(family="Arial", size=sf(13))
         self.font_small = ctk.CTkFont(family="Arial", size=sf(12))
         
+        # Render every emoji the UI uses once, off-screen, so Tk resolves its
+        # fallback emoji font before the first tab that shows them
+        warmup = ctk.CTkLabel(self.root, text=_UI_EMOJI, font=self.font_small)
+        warmup.place(x=-1000, y=-1000)
+        self.root.update_idletasks()
+        warmup.destroy()
+        
+        # Hot palette entries bound once so widget construction skips the dict lookups
+        self._c_primary = COLORS["primary"]
+        self._c_accent = COLORS["accent"]
+        self._c_border = COLORS["border"]
+        self._c_bg_light = COLORS["bg_light"]
+        self._c_text_primary = COLORS["text_primary"]
+        self._c_text_secondary = COLORS["text_secondary"]
+        
+        # Shared widget options for the static info cards
+        self._tip_card_kw = {"fg_color": self._c_bg_light, "border_width": 1, "border_color": self._c_border}
+        self._specialist_card_kw = {"fg_color": self._c_bg_light, "border_width": 2, "border_color": self._c_accent}
+        self._card_title_kw = {"font": self.font_med_bold, "text_color": self._c_primary}
+        self._card_body_kw = {"font": self.font_small, "text_color": self._c_text_secondary, "justify": "left"}
+        # Card spacing per tab: (card padx, card pady, inner padx, title pady, body pady)
+        self._tip_card_pad = (8, 6, 10, (8, 4), (0, 8))
+        self._specialist_card_pad = (10, 8, 12, (10, 5), (0, 10))
+        
         # Configure window
         self.root.configure(fg_color=COLORS["bg_light"])
         
@@ -83,8 +313,44 @@ class HealthcareAssistantGUI:
             self.demo_mode = False
         
         self.is_processing = False
-        self.consultation_history = []
+        # Only the most recent consultations are kept in memory (older ones are
+        # archived to _HISTORY_LOG); the history tab is updated incrementally
+        # from _history_count
+        self.consultation_history = deque(maxlen=50)
+        self._history_count = 0
+        self._history_rendered = 0
+        # Workers record history while the main thread renders it
+        self._history_lock = threading.Lock()
+        self._exact_cache = ExactCache(path=os.path.join(CACHE_DIR, "gui_exact.pkl"))
+        self._semantic_cache = SemanticCache(path=os.path.join(CACHE_DIR, "gui_semantic.pkl"))
+        self._genai = None
+        self._memory = _MemoryStore()
+        
+        # The LLM client is built once and agents once per specialist, both on
+        # first use so CrewAI is only imported when a consultation runs
+        self._llm = None
+        self._agents = {}
+        
+        # Reuse worker threads for consultations instead of spawning one per click
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="medai-llm")
+        # Bumped per consultation; results tagged with an older id are dropped
+        self._request_id = 0
+        # Archived history lines are handed to one writer thread that owns
+        # the log file, so consultation threads never wait on the disk
+        self._log_q = queue.Queue()
+        try:
+            self._log_fd = os.open(_HISTORY_LOG, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        except OSError as e:
+            print("History archive error:", repr(e))
+            self._log_fd = None
+        self._log_thread = threading.Thread(target=self._log_writer, name="medai-log", daemon=True)
+        self._log_thread.start()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         self.setup_ui()
+        
+        # Warm the CrewAI import in the background once the window has painted
+        if not self.demo_mode:
+            self.root.after(100, self._executor.submit, self._ensure_crewai)
     
     def setup_ui(self):
         """Setup the professional healthcare website-style UI"""
@@ -109,13 +375,13 @@ class HealthcareAssistantGUI:
     def setup_navbar(self):
         """Create professional navigation bar"""
         # Adjust navbar height relative to window height for better fit on smaller screens
-        nav_height = max(56, int(self.root.winfo_height() * 0.09))
-        navbar = ctk.CTkFrame(self.root, fg_color=COLORS["primary"], height=nav_height)
+        nav_height = max(56, int(self._init_height * 0.09))
+        navbar = ctk.CTkFrame(self.root, fg_color=self._c_primary, height=nav_height)
         navbar.grid(row=0, column=0, sticky="ew", padx=0, pady=0)
         navbar.grid_propagate(False)
         
         # Logo and title area
-        logo_frame = ctk.CTkFrame(navbar, fg_color=COLORS["primary"])
+        logo_frame = ctk.CTkFrame(navbar, fg_color=self._c_primary)
         logo_frame.pack(side="left", padx=25, pady=15)
         
         logo_label = ctk.CTkLabel(
@@ -130,12 +396,12 @@ class HealthcareAssistantGUI:
             logo_frame,
             text="Intelligent Healthcare Platform",
             font=self.font_norm,
-            text_color=COLORS["accent"]
+            text_color=self._c_accent
         )
         subtitle_label.pack(side="left", padx=(15, 0))
         
         # Status indicator
-        status_frame = ctk.CTkFrame(navbar, fg_color=COLORS["primary"])
+        status_frame = ctk.CTkFrame(navbar, fg_color=self._c_primary)
         status_frame.pack(side="right", padx=25, pady=15)
         
         self.status_indicator = ctk.CTkLabel(
@@ -153,17 +419,31 @@ class HealthcareAssistantGUI:
             fg_color=COLORS["bg_light"],
             text_color=COLORS["text_primary"],
             border_color=COLORS["border"],
-            border_width=2
+            border_width=2,
+            command=self._on_tab_change
         )
         # Slightly smaller padding to fit smaller screens better
         tabview.pack(fill="both", expand=True, padx=6, pady=6)
+        self.tabview = tabview
         
-        # Add tabs
+        # Add tabs; only the Consultation tab is built up front, the rest
+        # are built the first time they are selected
         self.setup_consultation_tab(tabview.add("🩺 Consultation"))
-        self.setup_health_assessment_tab(tabview.add("📊 Health Assessment"))
-        self.setup_wellness_tips_tab(tabview.add("💡 Wellness Tips"))
-        self.setup_doctor_profiles_tab(tabview.add("👨‍⚕️ Specialists"))
-        self.setup_history_tab(tabview.add("📋 History"))
+        self._tab_builders = {
+            "📊 Health Assessment": self.setup_health_assessment_tab,
+            "💡 Wellness Tips": self.setup_wellness_tips_tab,
+            "👨‍⚕️ Specialists": self.setup_doctor_profiles_tab,
+            "📋 History": self.setup_history_tab,
+        }
+        for name in self._tab_builders:
+            tabview.add(name)
+    
+    def _on_tab_change(self):
+        """Build a deferred tab the first time it is opened"""
+        name = self.tabview.get()
+        builder = self._tab_builders.pop(name, None)
+        if builder is not None:
+            builder(self.tabview.tab(name))
     
     def setup_consultation_tab(self, tab):
         """Main consultation interface with horizontal split layout"""
@@ -172,14 +452,14 @@ class HealthcareAssistantGUI:
         tab.grid_columnconfigure(0, weight=1)
         
         # Header card
-        header_card = ctk.CTkFrame(tab, fg_color="white", border_width=2, border_color=COLORS["border"])
+        header_card = ctk.CTkFrame(tab, fg_color="white", border_width=2, border_color=self._c_border)
         header_card.grid(row=0, column=0, sticky="ew", padx=10, pady=10)
         
         header_title = ctk.CTkLabel(
             header_card,
             text="💬 Get Medical Guidance",
             font=self.font_med_bold,
-            text_color=COLORS["primary"]
+            text_color=self._c_primary
         )
         header_title.pack(pady=(15, 5), padx=15)
         
@@ -187,19 +467,19 @@ class HealthcareAssistantGUI:
             header_card,
             text="Consult with AI-powered medical specialists for instant healthcare guidance",
             font=self.font_small,
-            text_color=COLORS["text_secondary"]
+            text_color=self._c_text_secondary
         )
         header_desc.pack(pady=(0, 15), padx=15)
         
         # Main horizontal split container
-        main_container = ctk.CTkFrame(tab, fg_color=COLORS["bg_light"])
+        main_container = ctk.CTkFrame(tab, fg_color=self._c_bg_light)
         main_container.grid(row=1, column=0, sticky="nsew", padx=6, pady=(0, 8))
         main_container.grid_rowconfigure(0, weight=1)
         main_container.grid_columnconfigure(0, weight=1)
         main_container.grid_columnconfigure(1, weight=1)
         
         # ===== LEFT SIDE - INPUT SECTION =====
-        left_frame = ctk.CTkFrame(main_container, fg_color="white", border_width=1, border_color=COLORS["border"])
+        left_frame = ctk.CTkFrame(main_container, fg_color="white", border_width=1, border_color=self._c_border)
         left_frame.grid(row=0, column=0, sticky="nsew", padx=(0, 4))
         left_frame.grid_rowconfigure(3, weight=1)
         left_frame.grid_columnconfigure(0, weight=1)
@@ -209,7 +489,7 @@ class HealthcareAssistantGUI:
             left_frame,
             text="👨‍⚕️ Select Specialist",
             font=self.font_med_bold,
-            text_color=COLORS["text_primary"]
+            text_color=self._c_text_primary
         )
         specialist_label.pack(anchor="w", padx=10, pady=(10, 4))
         
@@ -217,7 +497,7 @@ class HealthcareAssistantGUI:
             left_frame,
             text="Choose the right healthcare expert for your needs",
             font=self.font_small,
-            text_color=COLORS["text_secondary"]
+            text_color=self._c_text_secondary
         )
         specialist_info.pack(anchor="w", padx=10, pady=(0, 8))
         
@@ -242,9 +522,9 @@ class HealthcareAssistantGUI:
             font=self.font_norm,
             height=36,
             fg_color="white",
-            border_color=COLORS["border"],
-            button_color=COLORS["accent"],
-            button_hover_color=COLORS["primary"]
+            border_color=self._c_border,
+            button_color=self._c_accent,
+            button_hover_color=self._c_primary
         )
         specialist_combo.pack(fill="x", padx=10, pady=(0, 12))
         
@@ -253,7 +533,7 @@ class HealthcareAssistantGUI:
             left_frame,
             text="📝 Describe Your Health Concern",
             font=self.font_med_bold,
-            text_color=COLORS["text_primary"]
+            text_color=self._c_text_primary
         )
         query_label.pack(anchor="w", padx=10, pady=(0, 6))
         
@@ -261,13 +541,14 @@ class HealthcareAssistantGUI:
         self.query_input = ctk.CTkTextbox(
             left_frame,
             font=self.font_norm,
-            fg_color=COLORS["bg_light"],
-            text_color=COLORS["text_primary"],
+            fg_color=self._c_bg_light,
+            text_color=self._c_text_primary,
             border_width=1,
-            border_color=COLORS["border"]
+            border_color=self._c_border
         )
         self.query_input.pack(fill="both", expand=True, padx=10, pady=(0, 12))
-        self.query_input.insert("1.0", "Describe your symptoms or health question in detail...")
+        self.query_input.insert("1.0", _PLACEHOLDER)
+        self._query_is_placeholder = True
         self.query_input.bind("<FocusIn>", self._clear_placeholder)
         self.query_input.bind("<FocusOut>", self._add_placeholder)
         
@@ -282,7 +563,7 @@ class HealthcareAssistantGUI:
             command=self.run_consultation,
             font=self.font_med_bold,
             height=36,
-            fg_color=COLORS["primary"],
+            fg_color=self._c_primary,
             hover_color=COLORS["hover"],
             text_color="white"
         )
@@ -302,7 +583,7 @@ class HealthcareAssistantGUI:
         clear_btn.pack(side="left")
         
         # ===== RIGHT SIDE - OUTPUT SECTION =====
-        right_frame = ctk.CTkFrame(main_container, fg_color="white", border_width=1, border_color=COLORS["border"])
+        right_frame = ctk.CTkFrame(main_container, fg_color="white", border_width=1, border_color=self._c_border)
         right_frame.grid(row=0, column=1, sticky="nsew", padx=(6, 0))
         right_frame.grid_rowconfigure(1, weight=1)
         right_frame.grid_columnconfigure(0, weight=1)
@@ -311,17 +592,17 @@ class HealthcareAssistantGUI:
             right_frame,
             text="💡 AI Medical Guidance",
             font=self.font_med_bold,
-            text_color=COLORS["text_primary"]
+            text_color=self._c_text_primary
         )
         output_label.pack(anchor="w", padx=15, pady=(12, 8))
         
         self.output_text = ctk.CTkTextbox(
             right_frame,
             font=self.font_small,
-            fg_color=COLORS["bg_light"],
-            text_color=COLORS["text_primary"],
+            fg_color=self._c_bg_light,
+            text_color=self._c_text_primary,
             border_width=1,
-            border_color=COLORS["border"]
+            border_color=self._c_border
         )
         self.output_text.pack(fill="both", expand=True, padx=10, pady=(0, 12))
         self.output_text.configure(state="disabled")
@@ -409,26 +690,7 @@ Our medical experts can provide personalized guidance based on your assessment."
         ]
         
         for title, content in tips_content:
-            tip_item = ctk.CTkFrame(tips_frame, fg_color=COLORS["bg_light"], border_width=1, border_color=COLORS["border"])
-            tip_item.pack(fill="x", padx=8, pady=6)
-            
-            tip_title = ctk.CTkLabel(
-                tip_item,
-                text=title,
-                font=self.font_med_bold,
-                text_color=COLORS["primary"]
-            )
-            tip_title.pack(anchor="w", padx=10, pady=(8, 4))
-
-            tip_text = ctk.CTkLabel(
-                tip_item,
-                text=content,
-                font=self.font_small,
-                text_color=COLORS["text_secondary"],
-                justify="left",
-                wraplength=420
-            )
-            tip_text.pack(anchor="w", padx=10, pady=(0, 8))
+            self._tip_card(tips_frame, title, content, self._tip_card_kw, self._tip_card_pad)
     
     def setup_doctor_profiles_tab(self, tab):
         """Healthcare specialists profiles"""
@@ -460,29 +722,20 @@ Our medical experts can provide personalized guidance based on your assessment."
         ]
         
         for name, icon, desc in specialists_data:
-            specialist_card = ctk.CTkFrame(specialists_frame, fg_color=COLORS["bg_light"], border_width=2, border_color=COLORS["accent"])
-            specialist_card.pack(fill="x", padx=10, pady=8)
-            
-            title_frame = ctk.CTkFrame(specialist_card, fg_color=COLORS["bg_light"])
-            title_frame.pack(fill="x", padx=12, pady=(10, 5))
-            
-            spec_icon = ctk.CTkLabel(
-                title_frame,
-                text=f"{icon} {name}",
-                font=self.font_med_bold,
-                text_color=COLORS["primary"]
+            self._tip_card(
+                specialists_frame, f"{icon} {name}", desc,
+                self._specialist_card_kw, self._specialist_card_pad, wraplength=500
             )
-            spec_icon.pack(anchor="w")
-            
-            spec_desc = ctk.CTkLabel(
-                specialist_card,
-                text=desc,
-                font=self.font_small,
-                text_color=COLORS["text_secondary"],
-                justify="left",
-                wraplength=500
-            )
-            spec_desc.pack(anchor="w", padx=12, pady=(0, 10))
+    
+    def _tip_card(self, parent, title, body, card_kw, pad, wraplength=420):
+        """Build a titled info card for the static Wellness and Specialists tabs"""
+        card_padx, card_pady, inner_padx, title_pady, body_pady = pad
+        card = ctk.CTkFrame(parent, **card_kw)
+        card.pack(fill="x", padx=card_padx, pady=card_pady)
+        
+        ctk.CTkLabel(card, text=title, **self._card_title_kw).pack(anchor="w", padx=inner_padx, pady=title_pady)
+        ctk.CTkLabel(card, text=body, wraplength=wraplength, **self._card_body_kw).pack(anchor="w", padx=inner_padx, pady=body_pady)
+        return card
     
     def setup_history_tab(self, tab):
         """Consultation history tab"""
@@ -498,42 +751,84 @@ Our medical experts can provide personalized guidance based on your assessment."
         )
         header.pack(pady=(20, 10), padx=15)
         
-        # History content
-        self.history_text = ctk.CTkTextbox(
+        # History table: Treeview only lays out the rows that are visible
+        style = ttk.Style(tab)
+        style.configure(
+            "History.Treeview",
+            font=self.font_small,
+            rowheight=26,
+            background=COLORS["bg_light"],
+            fieldbackground=COLORS["bg_light"],
+            foreground=COLORS["text_primary"],
+            borderwidth=0
+        )
+        style.configure("History.Treeview.Heading", font=self.font_small, foreground=COLORS["primary"])
+        
+        table = ctk.CTkFrame(tab, fg_color=COLORS["bg_light"], border_width=1, border_color=COLORS["border"])
+        table.pack(fill="both", expand=True, padx=15, pady=(15, 5))
+        
+        self.history_tree = ttk.Treeview(
+            table,
+            columns=("time", "spec", "query"),
+            show="headings",
+            style="History.Treeview"
+        )
+        self.history_tree.heading("time", text="Date", anchor="w")
+        self.history_tree.heading("spec", text="Specialist", anchor="w")
+        self.history_tree.heading("query", text="Query", anchor="w")
+        self.history_tree.column("time", width=150, minwidth=130, stretch=False)
+        self.history_tree.column("spec", width=240, minwidth=160, stretch=False)
+        self.history_tree.column("query", width=400, minwidth=200, stretch=True)
+        
+        scrollbar = ctk.CTkScrollbar(table, command=self.history_tree.yview)
+        self.history_tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y", padx=(0, 2), pady=2)
+        self.history_tree.pack(side="left", fill="both", expand=True, padx=(2, 0), pady=2)
+        
+        # Empty-state / archive note under the table
+        self.history_note = ctk.CTkLabel(
             tab,
+            text="",
             font=self.font_small,
-            fg_color=COLORS["bg_light"],
-            text_color=COLORS["text_primary"],
-            border_width=1,
-            border_color=COLORS["border"]
+            text_color=COLORS["text_secondary"]
         )
-        self.history_text.pack(fill="both", expand=True, padx=15, pady=15)
-        self.history_text.configure(state="disabled")
+        self.history_note.pack(pady=(0, 10), padx=15, anchor="w")
         
         self.update_history_display()
     
     def _clear_placeholder(self, event):
         """Clear placeholder text"""
-        placeholder = "Describe your symptoms or health question in detail..."
-        if self.query_input.get("1.0", "end-1c") == placeholder:
+        if self._query_is_placeholder:
             self.query_input.delete("1.0", "end")
+            self._query_is_placeholder = False
     
     def _add_placeholder(self, event):
         """Add placeholder text back if empty"""
-        if not self.query_input.get("1.0", "end-1c").strip():
-            placeholder = "Describe your symptoms or health question in detail..."
-            self.query_input.insert("1.0", placeholder)
+        if not self._query_is_placeholder and self.query_input.index("end-1c") == "1.0":
+            self.query_input.insert("1.0", _PLACEHOLDER)
+            self._query_is_placeholder = True
     
     def clear_all(self):
         """Clear input and output"""
         self.query_input.delete("1.0", "end")
-        placeholder = "Describe your symptoms or health question in detail..."
-        self.query_input.insert("1.0", placeholder)
+        # Buttons don't take focus, so the cursor may still be in the query box;
+        # the placeholder only goes back once the box loses focus
+        try:
+            focused = str(self.root.focus_get())
+        except KeyError:
+            # Focus is on a Tk-internal widget (e.g. an open dropdown menu)
+            focused = ""
+        if focused.startswith(str(self.query_input)):
+            self._query_is_placeholder = False
+        else:
+            self.query_input.insert("1.0", _PLACEHOLDER)
+            self._query_is_placeholder = True
         
-        self.output_text.configure(state="normal")
-        self.output_text.delete("1.0", "end")
-        self.output_text.configure(state="disabled")
+        self._apply_result("")
         
+        # Abandon any consultation still in flight
+        self._request_id += 1
+        self.is_processing = False
         self.status_indicator.configure(text="● Ready", text_color=COLORS["success"])
     
     def run_consultation(self):
@@ -551,134 +846,133 @@ Our medical experts can provide personalized guidance based on your assessment."
             return
         
         # Get query
-        query = self.query_input.get("1.0", "end-1c").strip()
-        placeholder = "Describe your symptoms or health question in detail..."
+        query = "" if self._query_is_placeholder else self.query_input.get("1.0", "end-1c").strip()
         
-        if not query or query == placeholder:
+        if not query:
             messagebox.showwarning("Input Required", "Please describe your health query!")
             return
         
         # Clear output
-        self.output_text.configure(state="normal")
-        self.output_text.delete("1.0", "end")
-        self.output_text.insert("1.0", "🔄 AI specialist is analyzing your query...")
-        self.output_text.configure(state="disabled")
+        self._apply_result("🔄 AI specialist is analyzing your query...")
         
         # Update status
         self.is_processing = True
         self.status_indicator.configure(text="● Analyzing", text_color=COLORS["warning"])
         
-        # Run in thread
-        thread = threading.Thread(target=self.execute_consultation, args=(query,))
-        thread.daemon = True
-        thread.start()
+        # Run on the shared worker pool
+        self._request_id += 1
+        request_id = self._request_id
+        future = self._executor.submit(self.execute_consultation, query, request_id)
+        future.add_done_callback(
+            lambda f: self.root.after_idle(self._on_consultation_done, f, request_id)
+        )
     
-    def execute_consultation(self, query):
-        """Execute consultation in background thread"""
+    def _on_consultation_done(self, future, request_id):
+        """Surface unexpected worker failures on the Tk main thread"""
+        if request_id != self._request_id:
+            return
+        error = future.exception()
+        if error is not None:
+            self.display_error(f"Error: {error}")
+    
+    def _embed_query(self, query):
+        """Return a normalized embedding of the query, or None if unavailable"""
         try:
-            specialist = self.specialist_var.get()
-            timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Agent configurations
-            agent_configs = {
-                "Medical Advisor": {
-                    "role": "Medical Advisor",
-                    "goal": "Provide accurate medical information and comprehensive guidance",
-                    "backstory": """You are an experienced medical advisor with extensive knowledge 
-                    of various medical conditions, symptoms, and treatments. You provide clear, 
-                    evidence-based medical information while emphasizing the importance of consulting 
-                    healthcare professionals for diagnosis and treatment."""
-                },
-                "Symptom Analyzer": {
-                    "role": "Symptom Analyzer",
-                    "goal": "Analyze symptoms and suggest possible conditions",
-                    "backstory": """You are a symptom analysis expert trained to identify patterns 
-                    in patient-reported symptoms. You provide possible explanations for symptoms, 
-                    assess severity, and recommend when immediate medical attention is needed."""
-                },
-                "Treatment Recommender": {
-                    "role": "Treatment Recommender",
-                    "goal": "Suggest evidence-based treatment options",
-                    "backstory": """You are a treatment specialist knowledgeable about various 
-                    medical treatments, medications, and therapies. You provide comprehensive 
-                    treatment information while emphasizing proper medical supervision."""
-                },
-                "Nutrition Specialist": {
-                    "role": "Nutrition Specialist",
-                    "goal": "Provide dietary guidance and nutritional advice",
-                    "backstory": """You are a certified nutritionist with expertise in therapeutic 
-                    nutrition and dietary management of diseases. You provide personalized 
-                    nutritional guidance based on health conditions."""
-                },
-                "Mental Health Counselor": {
-                    "role": "Mental Health Counselor",
-                    "goal": "Provide mental health support and coping strategies",
-                    "backstory": """You are a compassionate mental health counselor trained in 
-                    psychology and therapeutic techniques. You provide emotional support, coping 
-                    strategies, and guidance for mental health concerns."""
-                },
-                "Fitness Coach": {
-                    "role": "Fitness Coach",
-                    "goal": "Provide exercise guidance and fitness recommendations",
-                    "backstory": """You are a certified fitness coach with expertise in exercise 
-                    physiology and rehabilitation. You create safe, effective exercise recommendations 
-                    tailored to individual health conditions."""
-                },
-                "Disease Educator": {
-                    "role": "Disease Educator",
-                    "goal": "Educate about diseases, prevention, and management",
-                    "backstory": """You are a health educator specializing in disease information 
-                    and prevention strategies. You explain complex medical concepts in clear language."""
-                },
-                "Preventive Medicine Expert": {
-                    "role": "Preventive Medicine Expert",
-                    "goal": "Provide prevention strategies and wellness recommendations",
-                    "backstory": """You are a preventive medicine expert focused on disease prevention 
-                    and health promotion. You provide actionable recommendations for maintaining health."""
-                },
-                "Emergency Response Advisor": {
-                    "role": "Emergency Response Advisor",
-                    "goal": "Provide emergency guidance and critical response information",
-                    "backstory": """You are an emergency medicine advisor trained in crisis management. 
-                    You provide immediate guidance for emergencies and identify when to call emergency services."""
-                }
-            }
-            
-            config = agent_configs.get(specialist, agent_configs["Medical Advisor"])
+            if self._genai is None:
+                import google.generativeai as genai
+                genai.configure(api_key=self.api_key)
+                self._genai = genai
             
-            # Create LLM
-            llm = LLM(
+            result = self._genai.embed_content(
+                model="models/text-embedding-004",
+                content=query,
+                task_type="retrieval_query"
+            )
+            embedding = np.asarray(result["embedding"], dtype=np.float32)
+            return embedding / np.linalg.norm(embedding)
+        except Exception as e:
+            print("Embedding error:", repr(e))
+            return None
+    
+    def _get_agent(self, specialist):
+        """Return the cached agent for a specialist, creating it on first use"""
+        if self._llm is None:
+            self._llm = LLM(
                 model="gemini/gemini-2.5-flash",
                 temperature=0.7,
                 api_key=self.api_key
             )
-            
-            # Create agent
+        
+        config = _AGENT_CONFIGS.get(specialist, _AGENT_CONFIGS["Medical Advisor"])
+        agent = self._agents.get(config["role"])
+        if agent is None:
             agent = Agent(
                 role=config["role"],
                 goal=config["goal"],
                 backstory=config["backstory"],
                 verbose=False,
-                llm=llm
+                llm=self._llm
             )
+            self._agents[config["role"]] = agent
+        return agent
+    
+    def _ensure_crewai(self):
+        """Import CrewAI into the module globals if it isn't loaded yet"""
+        global Agent, Task, Crew, LLM
+        if Agent is None:
+            from crewai import Agent as _Agent, Task as _Task, Crew as _Crew, LLM as _LLM
+            # Publish Agent last: it is the flag other threads check
+            Task, Crew, LLM = _Task, _Crew, _LLM
+            Agent = _Agent
+    
+    def execute_consultation(self, query, request_id):
+        """Execute consultation in background thread"""
+        try:
+            specialist = self.specialist_var.get()
+            timestamp = datetime.now().isoformat(sep=" ", timespec="seconds")
+            preview = query[:100]
+            
+            # Summary of earlier answered consultations, for the prompt
+            memory = self._memory.context()
+            
+            # Identical repeat questions skip both the embedding and the LLM
+            cached_result = self._exact_cache.get(specialist, query)
+            if cached_result is not None:
+                history_entry = (timestamp, f"{specialist} (cached)", preview)
+                self._record_history(history_entry)
+                self._memory.record(specialist, query, timestamp)
+                self.root.after_idle(
+                    self._deliver_result, request_id,
+                    self._format_result(specialist, timestamp, cached_result)
+                )
+                return
+            
+            # Serve semantically equivalent repeat questions from the cache
+            embedding = self._embed_query(query)
+            if embedding is not None:
+                cached_result = self._semantic_cache.lookup(specialist, embedding)
+                if cached_result is not None:
+                    history_entry = (timestamp, f"{specialist} (cached)", preview)
+                    self._record_history(history_entry)
+                    self._memory.record(specialist, query, timestamp)
+                    self.root.after_idle(
+                        self._deliver_result, request_id,
+                        self._format_result(specialist, timestamp, cached_result)
+                    )
+                    return
+            
+            # Only a cache miss needs CrewAI (normally already warmed in the background)
+            self._ensure_crewai()
+            
+            # Reuse the prebuilt agent; only the task and crew are per query
+            agent = self._get_agent(specialist)
             
             # Create task
+            description = _TASK_TEMPLATE.format(specialist=specialist, query=query)
+            if memory:
+                description += _CONTEXT_TMPL.format(memory=memory)
             task = Task(
-                description=f"""
-                As a {specialist}, analyze the following health query and provide helpful guidance:
-                
-                QUERY: {query}
-                
-                INSTRUCTIONS:
-                1. Provide clear, accurate information
-                2. If symptoms are mentioned, explain possible conditions (not diagnoses)
-                3. Suggest when to seek medical attention
-                4. Provide practical recommendations
-                5. Always remind this is informational, not medical advice
-                6. Be compassionate and supportive
-                
-                Provide a comprehensive, well-structured response.
-                """,
+                description=description,
                 agent=agent,
                 expected_output="Comprehensive healthcare guidance"
             )
@@ -692,79 +986,74 @@ Our medical experts can provide personalized guidance based on your assessment."
             
             result = crew.kickoff()
             
-            # Format result
-            formatted_result = f"""
-┌─────────────────────────────────────────────────────────┐
-│ 🏥 {specialist.upper()}
-└─────────────────────────────────────────────────────────┘
-📅 Consultation Date: {timestamp}
-
-{result}
-
-─────────────────────────────────────────────────────────
-
-⚠️  MEDICAL DISCLAIMER
-This guidance is informational only and not a substitute for 
-professional medical advice. Always consult qualified healthcare 
-professionals for diagnosis, treatment, and emergency situations.
-
-─────────────────────────────────────────────────────────"""
+            # Cache the bare answer; the dated framing is added per delivery
+            answer = str(result)
+            formatted_result = self._format_result(specialist, timestamp, answer)
+            
+            self._exact_cache.put(specialist, query, answer)
+            if embedding is not None:
+                self._semantic_cache.store(specialist, embedding, answer)
             
             # Add to history
-            history_entry = f"\n[{timestamp}] {specialist}: {query[:100]}...\n"
-            self.consultation_history.append(history_entry)
+            history_entry = (timestamp, specialist, preview)
+            self._record_history(history_entry)
+            self._memory.record(specialist, query, timestamp)
             
             # Display result
-            self.root.after(0, self.display_result, formatted_result)
+            self.root.after_idle(self._deliver_result, request_id, formatted_result)
             
         except Exception as e:
             # Log exception to console for debugging
             print("Consultation error:", repr(e))
 
             # Provide a friendly fallback (demo) response so the UI stays usable
-            simulated_result = f"""
-┌─────────────────────────────────────────────────────────┐
-│ 🏥 {specialist.upper()} (Demo Response)
-└─────────────────────────────────────────────────────────┘
-📅 Consultation Date: {timestamp}
-
-It appears the live AI consultation failed to complete (network or API error).
-Below is a simulated guidance response so you can continue testing the application layout and flow.
-
--- SAMPLE GUIDANCE START --
-
-Thank you for describing your concern. Based on the symptoms you've provided, here are some possibilities and suggestions:
-
-- Common causes may include muscle strain, overuse, or minor nerve irritation.
-- If you have sudden severe pain, numbness, weakness, or loss of function, seek immediate medical attention.
-- For mild to moderate pain: rest, ice, compression, elevation (RICE) and use over-the-counter analgesics as appropriate.
-- Monitor for worsening symptoms and consult a healthcare professional if symptoms persist beyond a few days.
-
--- SAMPLE GUIDANCE END --
-
-⚠️ Note: This is a simulated message. The real AI consultation failed with error: {str(e)}
-
-"""
+            simulated_result = _FALLBACK_TEMPLATE.format_map({
+                "specialist": specialist.upper(),
+                "timestamp": timestamp,
+                "err": str(e),
+            })
 
             # Add to history with an indicator that this was a fallback
-            history_entry = f"\n[{timestamp}] {specialist} (demo fallback): {query[:100]}...\n"
-            self.consultation_history.append(history_entry)
+            history_entry = (timestamp, f"{specialist} (demo fallback)", preview)
+            self._record_history(history_entry)
 
             # Display the simulated result instead of an error popup
-            self.root.after(0, self.display_result, simulated_result)
+            self.root.after_idle(self._deliver_result, request_id, simulated_result)
+    
+    def _format_result(self, specialist, timestamp, answer):
+        """Frame an answer with the specialist header, consultation date and disclaimer"""
+        return "".join((
+            _HEADER_TMPL.format(spec=specialist.upper(), ts=timestamp),
+            answer,
+            _FOOTER
+        ))
+    
+    def _deliver_result(self, request_id, result):
+        """Display a worker's result unless a newer request has superseded it"""
+        if request_id == self._request_id:
+            self.display_result(result)
+        else:
+            self.update_history_display()
+    
+    def _apply_result(self, text):
+        """Replace the output panel's text in one batch and redraw it once"""
+        w = self.output_text
+        w.configure(state="normal")
+        w.delete("1.0", "end")
+        w.insert("1.0", text)
+        w.configure(state="disabled")
+        w.see("1.0")  # Ensure text is visible
+        w.update_idletasks()
     
     def display_result(self, result):
         """Display consultation result"""
         try:
-            self.output_text.configure(state="normal")
-            self.output_text.delete("1.0", "end")
-            self.output_text.insert("1.0", result)
-            self.output_text.see("1.0")  # Ensure text is visible
-            self.output_text.configure(state="disabled")
+            self._apply_result(result)
             
             self.is_processing = False
             self.status_indicator.configure(text="● Complete", text_color=COLORS["success"])
-            self.update_history_display()
+            # Refresh the history table as its own idle job, after the result is painted
+            self.root.after_idle(self.update_history_display)
         except Exception as e:
             print(f"Error displaying result: {e}")
             self.is_processing = False
@@ -772,30 +1061,81 @@ Thank you for describing your concern. Based on the symptoms you've provided, he
     
     def display_error(self, error_msg):
         """Display error message"""
-        self.output_text.configure(state="normal")
-        self.output_text.delete("1.0", "end")
-        self.output_text.insert("1.0", error_msg)
-        self.output_text.configure(state="disabled")
+        self._apply_result(error_msg)
         
         self.is_processing = False
         self.status_indicator.configure(text="● Error", text_color=COLORS["danger"])
         messagebox.showerror("Error", "Consultation failed. Check output for details.")
     
+    def _record_history(self, entry):
+        """Append a (timestamp, specialist, query preview) entry to the consultation history"""
+        history = self.consultation_history
+        with self._history_lock:
+            if len(history) == history.maxlen:
+                # The oldest entry is about to be evicted; keep it on disk
+                self._log_q.put("[{}] {}: {}\n".format(*history[0]))
+            history.append(entry)
+            self._history_count += 1
+    
     def update_history_display(self):
-        """Update consultation history display"""
-        if hasattr(self, 'history_text'):
-            self.history_text.configure(state="normal")
-            self.history_text.delete("1.0", "end")
-            
-            if self.consultation_history:
-                header = "📋 YOUR CONSULTATION HISTORY\n" + "="*50 + "\n\n"
-                self.history_text.insert("1.0", header)
-                for entry in reversed(self.consultation_history):
-                    self.history_text.insert("end", entry)
-            else:
-                self.history_text.insert("1.0", "No consultations yet.\n\nUse the Consultation tab to start your first medical consultation.")
-            
-            self.history_text.configure(state="disabled")
+        """Add newly recorded consultations to the history table"""
+        if not hasattr(self, 'history_tree'):
+            return
+        
+        # One consistent snapshot, since workers may record more meanwhile
+        with self._history_lock:
+            count = self._history_count
+            entries = list(self.consultation_history)
+        
+        maxlen = self.consultation_history.maxlen
+        new_count = min(count - self._history_rendered, len(entries))
+        if new_count:
+            # Newest first: each new row goes on top, existing rows are untouched
+            for entry in entries[-new_count:]:
+                self.history_tree.insert("", 0, values=entry)
+            rows = self.history_tree.get_children()
+            if len(rows) > maxlen:
+                self.history_tree.delete(*rows[maxlen:])
+            self.history_tree.update_idletasks()
+        
+        if not entries:
+            note = "No consultations yet. Use the Consultation tab to start your first medical consultation."
+        elif count > len(entries):
+            note = f"Older history archived to disk ({_HISTORY_LOG})"
+        else:
+            note = ""
+        self.history_note.configure(text=note)
+        self._history_rendered = count
+    
+    def _log_writer(self):
+        """Append queued history lines to the archive until a None arrives"""
+        get = self._log_q.get
+        fd = self._log_fd
+        while True:
+            line = get()
+            if line is None:
+                break
+            if fd is None:
+                continue
+            try:
+                os.write(fd, line.encode("utf-8"))
+            except OSError as e:
+                print("History archive error:", repr(e))
+        if fd is not None:
+            os.close(fd)
+    
+    def _on_close(self):
+        """Stop the worker pool, persist the caches and close the window"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        # Let the log writer drain what is queued, without holding up the exit
+        self._log_q.put(None)
+        self._log_thread.join(timeout=1)
+        try:
+            self._exact_cache.save()
+            self._semantic_cache.save()
+        except Exception as e:
+            print("Cache save error:", repr(e))
+        self.root.destroy()
     
     def run(self):
         """Start the application"""
@@ -3,57 +3,156 @@ AI Healthcare Assistant - Interactive CLI
 Specialized healthcare agents powered by CrewAI and Gemini AI
 """
 
-from crewai import Agent, Task, Crew, LLM
 import os
-from dotenv import load_dotenv
+import sys
+from healthcare_cache import CACHE_DIR, ExactCache, SemanticCache, local_embedding
 
-# Load API key
-load_dotenv()
+# Load API key from .env only when it isn't already in the environment
+if "GOOGLE_API_KEY" not in os.environ:
+    from dotenv import load_dotenv
+    load_dotenv()
+
+# Specialist agent definitions: role -> (goal, backstory)
+_AGENT_CONFIGS = {
+    "Medical Advisor": (
+        "Provide accurate medical information and guidance",
+        """You are an experienced medical advisor with extensive knowledge 
+        of various medical conditions, symptoms, and treatments. You provide clear, 
+        evidence-based medical information while always emphasizing the importance 
+        of consulting healthcare professionals for diagnosis and treatment."""
+    ),
+    "Symptom Analyzer": (
+        "Analyze symptoms and suggest possible conditions",
+        """You are a symptom analysis expert trained to identify patterns 
+        in patient-reported symptoms. You provide possible explanations for symptoms, 
+        assess severity, and recommend when immediate medical attention is needed. 
+        You never provide definitive diagnoses."""
+    ),
+    "Treatment Recommender": (
+        "Suggest evidence-based treatment options and lifestyle changes",
+        """You are a treatment specialist knowledgeable about various 
+        medical treatments, medications, therapies, and lifestyle modifications. 
+        You provide comprehensive treatment information while emphasizing proper 
+        medical supervision."""
+    ),
+    "Nutrition Specialist": (
+        "Provide dietary guidance and nutritional advice",
+        """You are a certified nutritionist with expertise in therapeutic 
+        nutrition, dietary management of diseases, and healthy eating. You provide 
+        personalized nutritional guidance based on health conditions and goals."""
+    ),
+    "Mental Health Counselor": (
+        "Provide mental health support and coping strategies",
+        """You are a compassionate mental health counselor trained in 
+        psychology and therapeutic techniques. You provide emotional support, coping 
+        strategies, and guidance for mental health concerns while recognizing when 
+        professional help is needed."""
+    ),
+    "Fitness Coach": (
+        "Provide exercise guidance and fitness recommendations",
+        """You are a certified fitness coach with expertise in exercise 
+        physiology, rehabilitation, and physical wellness. You create safe, effective 
+        exercise recommendations tailored to individual health conditions and fitness levels."""
+    ),
+    "Disease Educator": (
+        "Educate about diseases, prevention, and management",
+        """You are a health educator specializing in disease information, 
+        prevention strategies, and self-management techniques. You explain complex 
+        medical concepts in clear, understandable language."""
+    )
+}
+
+# One (LLM, Agent) pair per specialist, built on first consultation
+_AGENT_CACHE = {}
+
+# Consultation prompt, filled in with the specialist and the user's query
+_TASK_TEMPLATE = """
+As a {specialist}, analyze the following health query and provide helpful guidance:
+
+QUERY: {query}
+
+INSTRUCTIONS:
+1. Provide clear, accurate information
+2. If symptoms are mentioned, explain possible conditions (not diagnoses)
+3. Suggest when to seek immediate medical attention
+4. Provide practical recommendations
+5. Include relevant health tips
+6. Always remind that this is informational, not medical advice
+7. Be compassionate and supportive in tone
+
+Provide a comprehensive, well-structured response.
+"""
+
+# Prompt per specialist with the role baked in, leaving only {query} to fill
+_TASK_TEMPLATES = {
+    specialist: _TASK_TEMPLATE.format(specialist=specialist, query="{query}")
+    for specialist in _AGENT_CONFIGS
+}
+
+_EXPECTED = "Comprehensive healthcare guidance with clear explanations"
+
+# Separator rules and the closing disclaimer
+_BAR80 = "=" * 80
+_BAR80_DASH = "-" * 80
+_DISCLAIMER = (
+    "⚠️  DISCLAIMER: This information is for educational purposes only.\n"
+    "Always consult qualified healthcare professionals for medical advice.\n"
+    + _BAR80
+)
+
+# Welcome banner, printed once at startup
+HEADER = "\n".join([
+    "\n" + _BAR80,
+    "🏥 AI HEALTHCARE ASSISTANT",
+    "Medical Guidance | Health Information | Wellness Support",
+    _BAR80,
+    "⚠️  DISCLAIMER: For informational purposes only",
+    "Always consult qualified healthcare professionals for medical advice",
+    _BAR80,
+    "",
+])
+
+# Specialist menu choices: key -> (role, description)
+_SPECIALISTS = {
+    '1': ('Medical Advisor', 'General medical information and guidance'),
+    '2': ('Symptom Analyzer', 'Analyze symptoms and suggest possible conditions'),
+    '3': ('Treatment Recommender', 'Evidence-based treatment options and lifestyle changes'),
+    '4': ('Nutrition Specialist', 'Dietary guidance and nutritional advice'),
+    '5': ('Mental Health Counselor', 'Mental health support and coping strategies'),
+    '6': ('Fitness Coach', 'Exercise guidance and fitness recommendations'),
+    '7': ('Disease Educator', 'Disease information, prevention, and management')
+}
+
+# Specialist menu, formatted once and written in a single call
+_MENU_STR = (
+    "👨‍⚕️ SELECT HEALTHCARE SPECIALIST:\n\n"
+    + "\n".join(f"  {key}. {role:<25} - {desc}" for key, (role, desc) in _SPECIALISTS.items())
+    + "\n\n"
+)
+
+# Answers to earlier questions, kept across sessions
+_EXACT_CACHE = ExactCache(path=os.path.join(CACHE_DIR, "cli_exact.pkl"))
+_SEMANTIC_CACHE = SemanticCache(path=os.path.join(CACHE_DIR, "cli_semantic.pkl"))
 
 def print_header():
     """Display welcome header"""
-    print("\n" + "=" * 80)
-    print("🏥 AI HEALTHCARE ASSISTANT")
-    print("Medical Guidance | Health Information | Wellness Support")
-    print("=" * 80)
-    print("⚠️  DISCLAIMER: For informational purposes only")
-    print("Always consult qualified healthcare professionals for medical advice")
-    print("=" * 80)
-    print()
+    print(HEADER)
 
 def get_healthcare_specialist():
     """Let user select healthcare specialist"""
-    print("👨‍⚕️ SELECT HEALTHCARE SPECIALIST:")
-    print()
-    
-    specialists = {
-        '1': ('Medical Advisor', 'General medical information and guidance'),
-        '2': ('Symptom Analyzer', 'Analyze symptoms and suggest possible conditions'),
-        '3': ('Treatment Recommender', 'Evidence-based treatment options and lifestyle changes'),
-        '4': ('Nutrition Specialist', 'Dietary guidance and nutritional advice'),
-        '5': ('Mental Health Counselor', 'Mental health support and coping strategies'),
-        '6': ('Fitness Coach', 'Exercise guidance and fitness recommendations'),
-        '7': ('Disease Educator', 'Disease information, prevention, and management')
-    }
-    
-    for key, (role, desc) in specialists.items():
-        print(f"  {key}. {role:<25} - {desc}")
-    
-    print()
+    sys.stdout.write(_MENU_STR)
     choice = input("Enter your choice (1-7): ").strip()
     
-    if choice in specialists:
-        role, description = specialists[choice]
-        return role, description
-    else:
+    role, description = _SPECIALISTS.get(choice, _SPECIALISTS['1'])
+    if choice not in _SPECIALISTS:
         print("⚠️  Invalid choice. Using default 'Medical Advisor'")
-        return specialists['1']
+    return role, description
 
 def get_health_query():
     """Get health query from user"""
-    print("\n" + "-" * 80)
+    print("\n" + _BAR80_DASH)
     print("📝 DESCRIBE YOUR HEALTH QUERY")
-    print("-" * 80)
+    print(_BAR80_DASH)
     print()
     print("Examples:")
     print("  • I have a persistent headache and sensitivity to light")
@@ -64,113 +163,69 @@ def get_health_query():
     print("Your query (press Enter twice when done):")
     print()
     
+    # Read straight from the buffered stream with the lookups bound locally
+    read = sys.stdin.readline
     lines = []
+    append = lines.append
     while True:
-        line = input()
+        raw = read()
+        if not raw:
+            # End of input
+            break
+        line = raw.rstrip("\n")
         if line:
-            lines.append(line)
-        else:
-            if lines:
-                break
+            append(line)
+        elif lines:
+            break
     
     return ' '.join(lines)
 
 def consult_healthcare_agent(specialist, description, query, api_key):
     """Execute healthcare consultation"""
-    print("\n" + "=" * 80)
+    print("\n" + _BAR80)
     print(f"🔍 {specialist.upper()} IS ANALYZING YOUR QUERY...")
-    print("=" * 80)
+    print(_BAR80)
     print()
     
     try:
-        # Agent configurations
-        agent_configs = {
-            "Medical Advisor": {
-                "goal": "Provide accurate medical information and guidance",
-                "backstory": """You are an experienced medical advisor with extensive knowledge 
-                of various medical conditions, symptoms, and treatments. You provide clear, 
-                evidence-based medical information while always emphasizing the importance 
-                of consulting healthcare professionals for diagnosis and treatment."""
-            },
-            "Symptom Analyzer": {
-                "goal": "Analyze symptoms and suggest possible conditions",
-                "backstory": """You are a symptom analysis expert trained to identify patterns 
-                in patient-reported symptoms. You provide possible explanations for symptoms, 
-                assess severity, and recommend when immediate medical attention is needed. 
-                You never provide definitive diagnoses."""
-            },
-            "Treatment Recommender": {
-                "goal": "Suggest evidence-based treatment options and lifestyle changes",
-                "backstory": """You are a treatment specialist knowledgeable about various 
-                medical treatments, medications, therapies, and lifestyle modifications. 
-                You provide comprehensive treatment information while emphasizing proper 
-                medical supervision."""
-            },
-            "Nutrition Specialist": {
-                "goal": "Provide dietary guidance and nutritional advice",
-                "backstory": """You are a certified nutritionist with expertise in therapeutic 
-                nutrition, dietary management of diseases, and healthy eating. You provide 
-                personalized nutritional guidance based on health conditions and goals."""
-            },
-            "Mental Health Counselor": {
-                "goal": "Provide mental health support and coping strategies",
-                "backstory": """You are a compassionate mental health counselor trained in 
-                psychology and therapeutic techniques. You provide emotional support, coping 
-                strategies, and guidance for mental health concerns while recognizing when 
-                professional help is needed."""
-            },
-            "Fitness Coach": {
-                "goal": "Provide exercise guidance and fitness recommendations",
-                "backstory": """You are a certified fitness coach with expertise in exercise 
-                physiology, rehabilitation, and physical wellness. You create safe, effective 
-                exercise recommendations tailored to individual health conditions and fitness levels."""
-            },
-            "Disease Educator": {
-                "goal": "Educate about diseases, prevention, and management",
-                "backstory": """You are a health educator specializing in disease information, 
-                prevention strategies, and self-management techniques. You explain complex 
-                medical concepts in clear, understandable language."""
-            }
-        }
+        # Repeated or near-identical questions are answered from the cache
+        cached_result = _EXACT_CACHE.get(specialist, query)
+        if cached_result is not None:
+            return True, cached_result
         
-        config = agent_configs.get(specialist, agent_configs["Medical Advisor"])
+        embedding = local_embedding(query)
+        if embedding is not None:
+            cached_result = _SEMANTIC_CACHE.lookup(specialist, embedding)
+            if cached_result is not None:
+                return True, cached_result
         
-        # Create LLM
-        llm = LLM(
-            model="gemini/gemini-2.5-flash",
-            temperature=0.7,
-            api_key=api_key
-        )
+        # CrewAI is slow to import, so it is only loaded once a query needs it
+        from crewai import Agent, Task, Crew, LLM
         
-        # Create healthcare agent
-        agent = Agent(
-            role=specialist,
-            goal=config["goal"],
-            backstory=config["backstory"],
-            verbose=False,
-            llm=llm
-        )
+        # Reuse this specialist's LLM and agent across consultations
+        cached = _AGENT_CACHE.get(specialist)
+        if cached is None:
+            goal, backstory = _AGENT_CONFIGS.get(specialist, _AGENT_CONFIGS["Medical Advisor"])
+            llm = LLM(
+                model="gemini/gemini-2.5-flash",
+                temperature=0.7,
+                api_key=api_key
+            )
+            agent = Agent(
+                role=specialist,
+                goal=goal,
+                backstory=backstory,
+                verbose=False,
+                llm=llm
+            )
+            cached = _AGENT_CACHE[specialist] = (llm, agent)
+        llm, agent = cached
         
         # Create task
         task = Task(
-            description=f"""
-            As a {specialist}, analyze the following health query and provide helpful guidance:
-            
-            QUERY: {query}
-            
-            INSTRUCTIONS:
-            1. Provide clear, accurate information
-            2. If symptoms are mentioned, explain possible conditions (not diagnoses)
-            3. Suggest when to seek immediate medical attention
-            4. Provide practical recommendations
-            5. Include relevant health tips
-            6. Always remind that this is informational, not medical advice
-            7. Be compassionate and supportive in tone
-            
-            Provide a comprehensive, well-structured response.
-            """,
+            description=_TASK_TEMPLATES[specialist].format(query=query),
             agent=agent,
-            expected_output="Comprehensive healthcare guidance with clear explanations"
+            expected_output=_EXPECTED
         )
         
         # Create and run crew
@@ -180,29 +235,36 @@ def consult_healthcare_agent(specialist, description, query, api_key):
             verbose=False
         )
         
-        result = crew.kickoff()
+        result = str(crew.kickoff())
+        
+        _EXACT_CACHE.put(specialist, query, result)
+        if embedding is not None:
+            _SEMANTIC_CACHE.store(specialist, embedding, result)
+        try:
+            _EXACT_CACHE.save()
+            _SEMANTIC_CACHE.save()
+        except Exception as e:
+            print(f"⚠️  Could not save cache: {e}")
         
-        return True, str(result)
+        return True, result
         
     except Exception as e:
         return False, f"Error: {str(e)}\nPlease check your internet connection and API key."
 
 def display_consultation_result(success, result, specialist):
     """Display the consultation response"""
-    print("\n" + "=" * 80)
+    print("\n" + _BAR80)
     if success:
         print(f"💡 {specialist.upper()} RESPONSE:")
     else:
         print("❌ ERROR:")
-    print("=" * 80)
+    print(_BAR80)
     print()
     print(result)
     print()
-    print("=" * 80)
+    print(_BAR80)
     if success:
-        print("⚠️  DISCLAIMER: This information is for educational purposes only.")
-        print("Always consult qualified healthcare professionals for medical advice.")
-        print("=" * 80)
+        print(_DISCLAIMER)
 
 def main():
     """Main program loop"""
@@ -224,9 +286,9 @@ def main():
         print(f"   {description}")
         
         # Get query
-        query = get_health_query()
+        query = get_health_query().strip()
         
-        if not query.strip():
+        if not query:
             print("\n⚠️  No query entered. Please try again.")
             continue
         
@@ -237,13 +299,13 @@ def main():
         display_consultation_result(success, result, specialist)
         
         # Ask to continue
-        print("\n" + "-" * 80)
+        print("\n" + _BAR80_DASH)
         continue_choice = input("Would you like another consultation? (yes/no): ").strip().lower()
         
         if continue_choice not in ['yes', 'y']:
             print("\n👋 Thank you for using AI Healthcare Assistant!")
             print("Stay healthy and take care!")
-            print("=" * 80)
+            print(_BAR80)
             break
         
         print("\n\n")
@@ -0,0 +1,183 @@
+"""
+Response caches shared by the GUI and CLI healthcare assistants
+Exact-match and embedding-similarity caches, persisted under ~/.healthcare_cache/
+"""
+
+import os
+import pickle
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+
+# Where caches are persisted between sessions
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".healthcare_cache")
+
+# Local sentence-transformers model, loaded on first use (False if unavailable)
+_local_model = None
+
+
+def _load(path):
+    """Return the object pickled at path, or None if it is missing or unreadable"""
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+def _dump(path, obj):
+    """Pickle obj to path, replacing the old file atomically"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def local_embedding(query):
+    """Return a normalized all-MiniLM-L6-v2 embedding of the query, or None if unavailable"""
+    global _local_model
+    if _local_model is None:
+        try:
+            from sentence_transformers import SentenceTransformer
+            _local_model = SentenceTransformer("all-MiniLM-L6-v2")
+        except Exception as e:
+            print("Embedding model unavailable:", repr(e))
+            _local_model = False
+    if _local_model is False:
+        return None
+    try:
+        return _local_model.encode(query, normalize_embeddings=True).astype(np.float32)
+    except Exception as e:
+        print("Embedding error:", repr(e))
+        return None
+
+
+def _best_match(bank, query):
+    """Return (row, cosine similarity) of the closest normalized embedding in bank"""
+    scores = bank @ query
+    best = int(scores.argmax())
+    return best, float(scores[best])
+
+
+class ExactCache:
+    """Recent results keyed by specialist and normalized query, evicted LRU"""
+    
+    def __init__(self, max_entries=256, ttl=3600, path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        # Key -> (created time, result)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if path is not None:
+            saved = _load(path) or {}
+            self._entries.update((k, v) for k, v in saved.items() if isinstance(v, tuple))
+    
+    @staticmethod
+    def _key(specialist, query):
+        """Hash the specialist and the case- and whitespace-normalized query"""
+        return hashlib.sha1(f"{specialist}\n{query.strip().lower()}".encode()).digest()
+    
+    def get(self, specialist, query):
+        """Return the cached result for this exact question, or None if absent or expired"""
+        key = self._key(specialist, query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time() - self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+    
+    def put(self, specialist, query, result):
+        """Remember a result, evicting the least recently used once full"""
+        with self._lock:
+            self._entries[self._key(specialist, query)] = (time.time(), result)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def save(self):
+        """Write the cache to its path, if it has one"""
+        if self.path is not None:
+            with self._lock:
+                _dump(self.path, self._entries)
+
+
+class SemanticCache:
+    """Recent consultation results, matched by query embedding similarity"""
+    
+    def __init__(self, threshold=0.92, max_entries=512, ttl=3600, path=None):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        # Per specialist: a contiguous (N, D) float32 matrix of normalized query
+        # embeddings plus parallel responses and created/last-used times
+        self._banks = (_load(path) if path is not None else None) or {}
+        self._lock = threading.Lock()
+    
+    def _expire(self, bank, now):
+        """Drop entries older than the TTL from a specialist bank"""
+        keep = bank["created"] > now - self.ttl
+        if not keep.all():
+            bank["vectors"] = np.ascontiguousarray(bank["vectors"][keep])
+            bank["created"] = bank["created"][keep]
+            bank["used"] = bank["used"][keep]
+            bank["responses"] = [r for r, k in zip(bank["responses"], keep) if k]
+    
+    def lookup(self, specialist, embedding):
+        """Return a cached response for a similar query, or None"""
+        now = time.time()
+        with self._lock:
+            bank = self._banks.get(specialist)
+            if bank is None:
+                return None
+            self._expire(bank, now)
+            if not bank["responses"] or bank["vectors"].shape[1] != embedding.shape[0]:
+                return None
+            
+            # One matrix-vector product scores every cached query at once
+            best, score = _best_match(bank["vectors"], embedding)
+            if score < self.threshold:
+                return None
+            
+            bank["used"][best] = now
+            return bank["responses"][best]
+    
+    def store(self, specialist, embedding, response):
+        """Remember a response for later similar queries"""
+        now = time.time()
+        with self._lock:
+            bank = self._banks.get(specialist)
+            if bank is None or bank["vectors"].shape[1] != embedding.shape[0]:
+                bank = self._banks[specialist] = {
+                    "vectors": np.empty((0, embedding.shape[0]), dtype=np.float32),
+                    "created": np.empty(0),
+                    "used": np.empty(0),
+                    "responses": [],
+                }
+            
+            # Evict the least recently used entry once the bank is full
+            if len(bank["responses"]) >= self.max_entries:
+                lru = int(bank["used"].argmin())
+                keep = np.arange(len(bank["responses"])) != lru
+                bank["vectors"] = bank["vectors"][keep]
+                bank["created"] = bank["created"][keep]
+                bank["used"] = bank["used"][keep]
+                del bank["responses"][lru]
+            
+            bank["vectors"] = np.vstack((bank["vectors"], embedding[np.newaxis, :]))
+            bank["created"] = np.append(bank["created"], now)
+            bank["used"] = np.append(bank["used"], now)
+            bank["responses"].append(response)
+    
+    def save(self):
+        """Write the cache to its path, if it has one"""
+        if self.path is not None:
+            with self._lock:
+                _dump(self.path, self._banks)